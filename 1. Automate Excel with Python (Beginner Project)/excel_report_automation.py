@@ -1,38 +1,94 @@
+from importlib.util import find_spec
+
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.formatting.rule import CellIsRule
 from openpyxl.chart import BarChart, Reference
 
 INPUT_FILE = "./1. Automate Excel with Python (Beginner Project)/sales_raw.xlsx"
 OUTPUT_FILE = "./1. Automate Excel with Python (Beginner Project)/Final_Sales_Report.xlsx"
-
-def auto_fit_columns(ws):
-    for col in ws.columns:
-        max_len = 0
-        col_letter = get_column_letter(col[0].column)
-        for cell in col:
-            val = "" if cell.value is None else str(cell.value)
-            max_len = max(max_len, len(val))
-        ws.column_dimensions[col_letter].width = min(max_len + 2, 40)
-
-def style_header(ws, header_row=1):
-    fill = PatternFill("solid", fgColor="1F4E79")  # dark blue
-    font = Font(color="FFFFFF", bold=True)
-    align = Alignment(horizontal="center", vertical="center")
-    for cell in ws[header_row]:
-        cell.fill = fill
-        cell.font = font
-        cell.alignment = align
-
-def add_borders(ws):
-    thin = Side(style="thin", color="D9D9D9")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
-    for row in ws.iter_rows():
-        for cell in row:
-            if cell.value is not None:
-                cell.border = border
+CHUNK_SIZE = 4096
+# Arrow-backed strings (C++ string kernels) when pyarrow is available; asked for
+# explicitly because plain "string" is python-backed on pandas 2.x
+TEXT_DTYPE = pd.StringDtype("pyarrow") if find_spec("pyarrow") else pd.StringDtype()
+
+# Header / body cell styles, registered on the workbook as named styles
+_HEADER_FILL = PatternFill("solid", fgColor="1F4E79")  # dark blue
+_HEADER_FONT = Font(color="FFFFFF", bold=True)
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+_THIN = Side(style="thin", color="D9D9D9")
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_STYLE = NamedStyle(name="header", fill=_HEADER_FILL, font=_HEADER_FONT,
+                          alignment=_HEADER_ALIGN, border=_BORDER)
+BODY_STYLE = NamedStyle(name="body_cell", border=_BORDER)
+
+def df_rows(df):
+    # NaN/NaT -> None so they come out as empty cells
+    for start in range(0, len(df), CHUNK_SIZE):
+        block = df.iloc[start:start + CHUNK_SIZE]
+        yield from block.astype(object).where(block.notna(), None).values.tolist()
+
+def cell_texts(col):
+    # Distinct values as Excel shows them: floats are written at %.16g and
+    # read back at their shortest, whole numbers without ".0" (50000.0 -> "50000")
+    values = col.unique()
+    if pd.api.types.is_float_dtype(col):
+        texts = np.char.mod("%.16g", values.astype(np.float64)).astype(np.float64).astype(str)
+        floats = np.ones(len(texts), dtype=bool)
+    else:
+        texts = np.array([str(float("%.16g" % v)) if isinstance(v, float) else str(v) for v in values])
+        floats = np.array([isinstance(v, float) for v in values], dtype=bool)
+    whole = floats & np.char.endswith(texts, ".0")
+    return np.where(whole, np.char.rpartition(texts, ".")[:, 0], texts)
+
+def autofit_from_df(ws, df, maxw=40, start_col=1):
+    # Widths must be in place before the first row of a write-only sheet
+    for i, name in enumerate(df.columns):
+        col = df.iloc[:, i].dropna()
+        if pd.api.types.is_datetime64_any_dtype(col):
+            mx = 19  # rendered as "yyyy-mm-dd h:mm:ss"
+        elif len(col):
+            mx = int(np.char.str_len(cell_texts(col)).max())
+        else:
+            mx = 0
+        mx = max(mx, len(str(name)))
+        ws.column_dimensions[get_column_letter(start_col + i)].width = min(mx + 2, maxw)
+
+def header_cells(ws, values):
+    cells = []
+    for val in values:
+        cell = WriteOnlyCell(ws, value=val)
+        cell.style = "header"
+        cells.append(cell)
+    return cells
+
+def body_cells(ws, rows, number_formats=None):
+    number_formats = number_formats or {}
+    for row in rows:
+        cells = []
+        for i, val in enumerate(row):
+            if val is None:
+                cells.append(None)
+                continue
+            cell = WriteOnlyCell(ws)
+            cell.style = "body_cell"
+            cell.value = val  # after .style, which would reset a date's format
+            if i in number_formats:
+                cell.number_format = number_formats[i]
+            cells.append(cell)
+        yield cells
+
+def write_df_streaming(wb, name, df):
+    ws = wb.create_sheet(name)
+    autofit_from_df(ws, df)
+    ws.append(header_cells(ws, df.columns))
+    for cells in body_cells(ws, df_rows(df)):
+        ws.append(cells)
+    return ws
 
 def main():
     # 1) Read
@@ -52,21 +108,18 @@ def main():
     df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
 
     # Sales cleaning: remove commas, convert to numeric
-    df["Sales"] = (
-        df["Sales"]
-        .astype(str)
-        .str.replace(",", "", regex=False)
-        .replace("None", None)
-    )
-    df["Sales"] = pd.to_numeric(df["Sales"], errors="coerce").fillna(0)
+    # (already-numeric columns skip the string pass entirely)
+    sales = df["Sales"]
+    if not pd.api.types.is_numeric_dtype(sales):
+        sales = sales.astype(TEXT_DTYPE).str.replace(",", "", regex=False)
+    df["Sales"] = pd.to_numeric(sales, errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
 
-    # Standardize text
-    df["Product"] = df["Product"].astype(str).str.strip().str.title()
-    df["Region"] = df["Region"].astype(str).str.strip().str.title()
+    # Standardize text (string dtype keeps missing values as <NA>, not "None")
+    df["Product"] = df["Product"].astype(TEXT_DTYPE).str.strip().str.title()
+    df["Region"] = df["Region"].astype(TEXT_DTYPE).str.strip().str.title()
 
     # Remove rows where date/product/region missing (optional; beginner-friendly)
-    df = df.dropna(subset=["Date"])
-    df = df[(df["Product"] != "None") & (df["Region"] != "None")]
+    df = df.dropna(subset=["Date", "Product", "Region"])
 
     # 3) Summary
     total_sales = float(df["Sales"].sum())
@@ -76,50 +129,15 @@ def main():
     top_product = product_summary.iloc[0]["Product"] if len(product_summary) else "N/A"
     top_product_sales = float(product_summary.iloc[0]["Sales"]) if len(product_summary) else 0.0
 
-    # 4) Write to Excel (using pandas first)
-    with pd.ExcelWriter(OUTPUT_FILE, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Clean_Data", index=False)
-        # Create a summary sheet layout
-        summary_rows = [
-            ["Metric", "Value"],
-            ["Total Sales", total_sales],
-            ["Top Product", top_product],
-            ["Top Product Sales", top_product_sales],
-        ]
-        pd.DataFrame(summary_rows[1:], columns=summary_rows[0]).to_excel(writer, sheet_name="Summary", index=False, startrow=0)
-
-        # Add region & product summaries below
-        region_summary.to_excel(writer, sheet_name="Summary", index=False, startrow=6)
-        product_summary.to_excel(writer, sheet_name="Summary", index=False, startrow=6 + len(region_summary) + 3)
-
-    # 5) Formatting with openpyxl
-    wb = load_workbook(OUTPUT_FILE)
-
-    ws_data = wb["Clean_Data"]
-    ws_sum = wb["Summary"]
-
-    # Style headers
-    style_header(ws_data, 1)
-    style_header(ws_sum, 1)
-
-    # Align and number formatting in Summary
-    for cell in ws_sum["B"]:
-        cell.number_format = "#,##0"
-
-    # Auto-fit
-    auto_fit_columns(ws_data)
-    auto_fit_columns(ws_sum)
-
-    # Borders
-    add_borders(ws_data)
-    add_borders(ws_sum)
+    # 4) Write to Excel (streamed, write-only workbook)
+    wb = Workbook(write_only=True)
+    wb.add_named_style(HEADER_STYLE)
+    wb.add_named_style(BODY_STYLE)
+    ws_data = write_df_streaming(wb, "Clean_Data", df)
 
     # Conditional formatting: highlight high sales in Clean_Data (Sales column)
-    # Find Sales column index
-    headers = [c.value for c in ws_data[1]]
-    sales_col_idx = headers.index("Sales") + 1
-    sales_col_letter = get_column_letter(sales_col_idx)
-    sales_range = f"{sales_col_letter}2:{sales_col_letter}{ws_data.max_row}"
+    sales_col_letter = get_column_letter(df.columns.get_loc("Sales") + 1)
+    sales_range = f"{sales_col_letter}2:{sales_col_letter}{len(df) + 1}"
 
     ws_data.conditional_formatting.add(
         sales_range,
@@ -127,8 +145,29 @@ def main():
                    fill=PatternFill("solid", fgColor="C6EFCE"))  # light green
     )
 
+    # 5) Summary sheet layout: metrics, then region & product summaries below
+    summary_rows = [
+        ["Metric", "Value"],
+        ["Total Sales", total_sales],
+        ["Top Product", top_product],
+        ["Top Product Sales", top_product_sales],
+        [None, None],
+        [None, None],
+        ["Region", "Sales"],
+        *df_rows(region_summary),
+        [None, None],
+        [None, None],
+        ["Product", "Sales"],
+        *df_rows(product_summary),
+    ]
+    ws_sum = wb.create_sheet("Summary")
+    autofit_from_df(ws_sum, pd.DataFrame(summary_rows[1:], columns=summary_rows[0]))
+    ws_sum.append(header_cells(ws_sum, summary_rows[0]))
+    for cells in body_cells(ws_sum, summary_rows[1:], number_formats={1: "#,##0"}):
+        ws_sum.append(cells)
+
     # 6) Add chart (Region-wise) in Summary sheet
-    # Region summary starts at row 7 (since startrow=6, +1 header)
+    # Region summary header is row 7
     region_start_row = 7
     region_end_row = region_start_row + len(region_summary)
 
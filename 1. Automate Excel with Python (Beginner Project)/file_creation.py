@@ -1,4 +1,5 @@
 import pandas as pd
+from openpyxl import Workbook
 
 data = [
     {"Date": "2026-01-01", "Product": "Laptop", "Region": "East", "Sales": 50000},
@@ -12,5 +13,12 @@ data = [
 ]
 
 df = pd.DataFrame(data)
-df.to_excel("./1. Automate Excel with Python (Beginner Project)/sales_raw.xlsx", index=False)
+
+# Stream rows into a write-only workbook (no in-memory cell grid)
+wb = Workbook(write_only=True)
+ws = wb.create_sheet("Sheet1")
+ws.append(list(df.columns))
+for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+    ws.append(row)
+wb.save("./1. Automate Excel with Python (Beginner Project)/sales_raw.xlsx")
 print("✅ sales_raw.xlsx created")
\ No newline at end of file
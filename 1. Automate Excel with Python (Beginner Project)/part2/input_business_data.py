@@ -1,5 +1,17 @@
 import numpy as np
 import pandas as pd
+from openpyxl import Workbook
+
+CHUNK_SIZE = 4096
+
+def write_sheet(wb, name, df):
+    # Stream rows into a write-only sheet (NaN/NaT -> empty cell)
+    ws = wb.create_sheet(name)
+    ws.append(list(df.columns))
+    for start in range(0, len(df), CHUNK_SIZE):
+        block = df.iloc[start:start + CHUNK_SIZE]
+        for row in block.astype(object).where(block.notna(), None).itertuples(index=False, name=None):
+            ws.append(row)
 
 np.random.seed(7)
 
@@ -74,12 +86,23 @@ for m in months:
 targets = pd.DataFrame(targets, columns=["month","region","target_sales"])
 
 # Save
-with pd.ExcelWriter("input_business_data.xlsx", engine="openpyxl") as w:
-    orders.to_excel(w, sheet_name="Orders", index=False)
-    products.to_excel(w, sheet_name="Products", index=False)
-    customers.to_excel(w, sheet_name="Customers", index=False)
-    returns.to_excel(w, sheet_name="Returns", index=False)
-    targets.to_excel(w, sheet_name="Targets", index=False)
+wb = Workbook(write_only=True)
+write_sheet(wb, "Orders", orders)
+write_sheet(wb, "Products", products)
+write_sheet(wb, "Customers", customers)
+write_sheet(wb, "Returns", returns)
+write_sheet(wb, "Targets", targets)
+wb.save("input_business_data.xlsx")
 
 print("✅ Created: input_business_data.xlsx")
 
+# Parquet copies for main.py: columnar and dtype-preserving, far quicker to
+# load than XLSX (needs pyarrow or fastparquet)
+try:
+    for name, df in [("orders", orders), ("products", products), ("customers", customers),
+                     ("returns", returns), ("targets", targets)]:
+        df.to_parquet(f"{name}.parquet", index=False)
+    print("✅ Created: Parquet copies (orders/products/customers/returns/targets)")
+except ImportError:
+    print("ℹ️ pyarrow/fastparquet not installed - skipped Parquet copies")
+
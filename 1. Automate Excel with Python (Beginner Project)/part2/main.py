@@ -1,59 +1,327 @@
+import os
+import zipfile
+from datetime import datetime
+from itertools import zip_longest
+from xml.sax.saxutils import escape
+
 import pandas as pd
 import numpy as np
-from openpyxl import load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.formatting.rule import CellIsRule
 from openpyxl.chart import LineChart, BarChart, Reference
 
 INPUT_FILE = "input_business_data.xlsx"
 OUTPUT_FILE = "Business_Report.xlsx"
-
-def style_sheet(ws, freeze="A2"):
+INPUT_SHEETS = ["Orders", "Products", "Customers", "Returns", "Targets"]
+CHUNK_SIZE = 4096
+XML_WRITE_SIZE = 64 * 1024
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+DENSE_ID_FACTOR = 4  # gather_by_id: direct table only if id span <= 4x row count
+
+# Built once; cells point at them by name (cell.style = "header"/"body_cell")
+_HEADER_FILL = PatternFill("solid", fgColor="1F4E79")  # dark blue
+_HEADER_FONT = Font(color="FFFFFF", bold=True)
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+_THIN = Side(style="thin", color="D9D9D9")
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_STYLE = NamedStyle(name="header", fill=_HEADER_FILL, font=_HEADER_FONT,
+                          alignment=_HEADER_ALIGN, border=_BORDER)
+BODY_STYLE = NamedStyle(name="body_cell", border=_BORDER)
+
+def read_input(path):
+    # Prefer the Parquet copies from input_business_data.py when they are at
+    # least as new as the workbook (no XLSX parsing at all)
+    parquet = {s: f"{s.lower()}.parquet" for s in INPUT_SHEETS}
+    if all(os.path.exists(p) and os.path.getmtime(p) >= os.path.getmtime(path)
+           for p in parquet.values()):
+        try:
+            return {s: pd.read_parquet(p) for s, p in parquet.items()}
+        except ImportError:
+            pass
+
+    # One read_excel call parses the workbook once for all sheets.
+    # calamine (Rust) is much faster; fall back to openpyxl if it isn't installed
+    # (ImportError) or pandas predates the engine (<2.2: ValueError "Unknown engine")
+    try:
+        return pd.read_excel(path, sheet_name=INPUT_SHEETS, engine="calamine")
+    except (ImportError, ValueError):
+        return pd.read_excel(path, sheet_name=INPUT_SHEETS, engine="openpyxl")
+
+def ensure_dt(s):
+    # Excel dates usually arrive as datetime64 already; only parse text columns
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    return pd.to_datetime(s, errors="coerce", cache=True)
+
+def clean_category(s):
+    # strip().title() each distinct value once instead of every row, and
+    # return a categorical (values that clean to the same label are merged;
+    # missing values keep code -1, i.e. stay NaN)
+    codes, uniques = pd.factorize(s)
+    cleaned = pd.Index([str(u).strip().title() for u in uniques])
+    cats = cleaned.unique().sort_values()
+    codes = np.where(codes >= 0, cats.get_indexer(cleaned)[codes], -1)
+    return pd.Categorical.from_codes(codes, categories=cats)
+
+def df_rows(df):
+    # Plain Python rows (NaN/NaT -> None), converted a chunk at a time
+    for start in range(0, len(df), CHUNK_SIZE):
+        block = df.iloc[start:start + CHUNK_SIZE]
+        yield from block.astype(object).where(block.notna(), None).values.tolist()
+
+def style_sheet(ws, header, rows, freeze="A2"):
+    # write-only: freeze panes must be set before the first row is appended
     ws.freeze_panes = freeze
-    header_fill = PatternFill("solid", fgColor="1F4E79")
-    header_font = Font(color="FFFFFF", bold=True)
-    header_align = Alignment(horizontal="center", vertical="center")
-
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_align
-
-    thin = Side(style="thin", color="D9D9D9")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-        for cell in row:
-            if cell.value is not None:
-                cell.border = border
-
-def autofit(ws, maxw=45):
-    for col in ws.columns:
-        mx = 0
-        col_letter = get_column_letter(col[0].column)
-        for c in col:
-            v = "" if c.value is None else str(c.value)
-            mx = max(mx, len(v))
-        ws.column_dimensions[col_letter].width = min(mx + 2, maxw)
+    cells = []
+    for v in header:
+        if v is None:
+            cells.append(None)
+            continue
+        cell = WriteOnlyCell(ws, value=v)
+        cell.style = "header"
+        cells.append(cell)
+    ws.append(cells)
+
+    for row in rows:
+        cells = []
+        for v in row:
+            if v is None:
+                cells.append(None)
+                continue
+            cell = WriteOnlyCell(ws)
+            cell.style = "body_cell"
+            cell.value = v  # set after the style so dates keep their number format
+            cells.append(cell)
+        ws.append(cells)
+
+def cell_texts(col):
+    # Distinct values as text, floats as they come back from the file: written
+    # at %.16g (like sheet_xml_rows), shown at their shortest, no trailing ".0"
+    values = col.unique()
+    if pd.api.types.is_float_dtype(col):
+        texts = np.char.mod("%.16g", values.astype(np.float64)).astype(np.float64).astype(str)
+        floats = np.ones(len(texts), dtype=bool)
+    else:
+        texts = np.array([str(float("%.16g" % v)) if isinstance(v, float) else str(v) for v in values])
+        floats = np.array([isinstance(v, float) for v in values], dtype=bool)
+    whole = floats & np.char.endswith(texts, ".0")
+    return np.where(whole, np.char.rpartition(texts, ".")[:, 0], texts)
+
+def autofit_from_df(ws, df, maxw=45, start_col=1):
+    # Size columns from the DataFrame (vectorized) instead of visiting cells;
+    # write-only sheets need widths set before the first row is appended
+    for i, name in enumerate(df.columns):
+        col = df.iloc[:, i].dropna()
+        if pd.api.types.is_datetime64_any_dtype(col):
+            mx = 19  # rendered as "yyyy-mm-dd h:mm:ss"
+        elif len(col):
+            mx = int(np.char.str_len(cell_texts(col)).max())
+        else:
+            mx = 0
+        mx = max(mx, len(str(name)))
+        ws.column_dimensions[get_column_letter(start_col + i)].width = min(mx + 2, maxw)
+
+def inline_string_xml(value):
+    # <is> element for one string, mirroring openpyxl: XML-illegal control
+    # characters dropped, edge whitespace kept with xml:space="preserve"
+    text = ILLEGAL_CHARACTERS_RE.sub("", str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f"<is><t{space}>{escape(text)}</t></is>"
+
+def sheet_xml_rows(ws, df):
+    # Body rows of a large sheet as hand-rolled <row> XML, spliced into the saved
+    # file by splice_sheet_rows() - no per-cell openpyxl objects at all.
+    # Style ids are registered on the workbook here, so call it before wb.save()
+    body = WriteOnlyCell(ws)
+    body.style = "body_cell"
+    date = WriteOnlyCell(ws)
+    date.style = "body_cell"
+    date.value = datetime(1900, 1, 1)  # picks up the date number format
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        col = df.iloc[:, i]
+        letter = get_column_letter(i + 1)
+        if pd.api.types.is_datetime64_any_dtype(col):
+            serials = ((col - EXCEL_EPOCH) / pd.Timedelta(days=1)).to_numpy(dtype=np.float64)
+            columns.append((f'<c r="{letter}', f'" s="{date.style_id}"><v>', serials, None))
+        elif pd.api.types.is_bool_dtype(col):
+            flags = col.to_numpy(dtype=np.float64, na_value=np.nan)
+            columns.append((f'<c r="{letter}', f'" s="{body.style_id}" t="b"><v>', flags, None))
+        elif pd.api.types.is_numeric_dtype(col):
+            columns.append((f'<c r="{letter}', f'" s="{body.style_id}"><v>', col.to_numpy(dtype=np.float64), None))
+        else:
+            # few distinct strings: escape each once, then gather by code
+            codes, uniques = pd.factorize(col)
+            texts = np.array([inline_string_xml(u) for u in uniques], dtype=object)
+            columns.append((f'<c r="{letter}', f'" s="{body.style_id}" t="inlineStr">', codes, texts))
+
+    def rows():
+        buf, size = [], 0
+        for start in range(0, len(df), CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, len(df))
+            rnums = np.arange(start + 2, stop + 2).astype(str).astype(object)
+            cells = []
+            for pre, mid, values, texts in columns:
+                part = values[start:stop]
+                if texts is None:
+                    ok = np.isfinite(part)
+                    xml = pre + rnums + mid + np.char.mod("%.16g", part).astype(object) + "</v></c>"
+                else:
+                    ok = part >= 0
+                    xml = pre + rnums + mid + texts[np.where(ok, part, 0)] + "</c>"
+                cells.append(np.where(ok, xml, ""))
+            for r, parts in zip(rnums, zip(*cells)):
+                row = f'<row r="{r}">' + "".join(parts) + "</row>"
+                buf.append(row)
+                size += len(row)
+                if size >= XML_WRITE_SIZE:
+                    yield "".join(buf).encode("utf-8")
+                    buf, size = [], 0
+        if buf:
+            yield "".join(buf).encode("utf-8")
+
+    return rows()
+
+def splice_sheet_rows(path, ws, rows):
+    # Append pre-rendered <row> XML to ws's sheetData inside the saved .xlsx
+    # (zip entries can't be replaced in place, so copy into a new archive)
+    name = ws.path[1:]
+    tmp = path + ".tmp"
+    try:
+        with zipfile.ZipFile(path) as zin, zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                data = zin.read(item)
+                if item.filename != name:
+                    zout.writestr(item, data)
+                    continue
+                head, tail = data.split(b"</sheetData>", 1)
+                with zout.open(item, "w") as f:
+                    f.write(head)
+                    for chunk in rows:
+                        f.write(chunk)
+                    f.write(b"</sheetData>")
+                    f.write(tail)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def gather_by_id(right, key, ids):
+    # Left-join `right` onto `ids` by array indexing instead of a hash join
+    # (ids missing from right -> NaN). Dense id ranges use a direct id -> row
+    # table; sparse ones fall back to a binary search over the sorted ids
+    right = right[right[key].notna()]
+    right_ids = right[key].to_numpy(dtype=np.int64)
+    if len(np.unique(right_ids)) != len(right_ids):
+        raise ValueError(f"Duplicate {key} values in lookup table")
+
+    ids = ids.to_numpy(dtype=np.int64)
+    pos = np.full(len(ids), -1, dtype=np.int64)
+    if len(right_ids):
+        lo = right_ids.min()
+        span = right_ids.max() - lo + 1
+        if span <= DENSE_ID_FACTOR * len(right_ids):
+            table = np.full(span, -1, dtype=np.int64)
+            table[right_ids - lo] = np.arange(len(right_ids))
+            ok = (ids >= lo) & (ids - lo < span)
+            pos[ok] = table[ids[ok] - lo]
+        else:
+            order = np.argsort(right_ids)
+            idx = np.minimum(np.searchsorted(right_ids[order], ids), len(right_ids) - 1)
+            hit = right_ids[order[idx]] == ids
+            pos[hit] = order[idx[hit]]
+
+    return pd.DataFrame({
+        c: pd.api.extensions.take(right[c].array, pos, allow_fill=True)
+        for c in right.columns if c != key
+    })
+
+def isin_sorted(values, sorted_ids):
+    # Membership test against a sorted unique array: one binary search per value
+    if not len(sorted_ids):
+        return np.zeros(len(values), dtype=bool)
+    idx = np.searchsorted(sorted_ids, values)
+    return sorted_ids[np.minimum(idx, len(sorted_ids) - 1)] == values
+
+def compute_pivot_region_month(model):
+    # One (month, region) group code per row, reduced per aggregate by that
+    # code; missing regions get their own group, sorted last like dropna=False.
+    # Both float sums come from one groupby(codes).sum() (compensated
+    # summation, same values as a plain groupby) - np.bincount would sum naively
+    m_codes, months = pd.factorize(model["month"], sort=True)
+    regions = model["region"].cat.categories
+    r_codes = model["region"].cat.codes.to_numpy().astype(np.int64)
+    r_codes[r_codes < 0] = len(regions)
+    width = len(regions) + 1
+    keys, inv = np.unique(m_codes * width + r_codes, return_inverse=True)
+    n = len(keys)
+    sums = model[["net_sales", "profit"]].groupby(inv).sum()
+    region_codes = keys % width
+    region_codes[region_codes == len(regions)] = -1
+
+    return pd.DataFrame({
+        "month": months[keys // width],
+        "region": pd.Categorical.from_codes(region_codes, categories=regions),
+        "net_sales": sums["net_sales"].to_numpy(),
+        "profit": sums["profit"].to_numpy(),
+        "orders": np.bincount(inv, minlength=n),
+        "returns": np.bincount(inv, weights=model["is_returned"].to_numpy(), minlength=n).astype(np.int64),
+    })
+
+def first_rank(a):
+    # 1-based ranks, ties broken by position (same as rank(method="first")),
+    # from a single stable argsort
+    ranks = np.empty(len(a), dtype=np.int64)
+    ranks[np.argsort(a, kind="stable")] = np.arange(1, len(a) + 1)
+    return ranks
+
+def quintile_score(a, reverse=False):
+    # 1..5 on the same edges as qcut(a, 5) (right-closed bins, lowest edge
+    # included), looked up with one searchsorted instead of a Categorical
+    edges = pd.Series(a).quantile(np.linspace(0, 1, 6)).to_numpy()
+    q = np.searchsorted(edges[1:-1], a, side="left") + 1
+    return 6 - q if reverse else q
+
+def quantile_select(a, q):
+    # Same value as Series.quantile(q) (linear interpolation, NaN skipped),
+    # but via np.partition (O(n) selection) instead of a full sort
+    a = a[~np.isnan(a)]
+    if not len(a):
+        return np.nan
+    pos = q * (len(a) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(a) - 1)
+    part = np.partition(a, [lo, hi])
+    return part[lo] + (part[hi] - part[lo]) * (pos - lo)
+
+def write_df_streaming(wb, name, df):
+    ws = wb.create_sheet(name)
+    autofit_from_df(ws, df)
+    style_sheet(ws, df.columns, df_rows(df))
+    return ws
 
 def main():
     # 1) Read all sheets
-    xls = pd.ExcelFile(INPUT_FILE)
-    orders = pd.read_excel(xls, "Orders")
-    products = pd.read_excel(xls, "Products")
-    customers = pd.read_excel(xls, "Customers")
-    returns = pd.read_excel(xls, "Returns")
-    targets = pd.read_excel(xls, "Targets")
+    sheets = read_input(INPUT_FILE)
+    orders = sheets["Orders"]
+    products = sheets["Products"]
+    customers = sheets["Customers"]
+    returns = sheets["Returns"]
+    targets = sheets["Targets"]
 
     # 2) Cleaning - Customers
-    customers["region"] = customers["region"].astype(str).str.strip().str.title()
-    customers["city"] = customers["city"].astype(str).str.strip().str.title()
-    customers["segment"] = customers["segment"].astype(str).str.strip().str.title()
-    customers["signup_date"] = pd.to_datetime(customers["signup_date"], errors="coerce")
+    customers["region"] = clean_category(customers["region"])
+    customers["city"] = clean_category(customers["city"])
+    customers["segment"] = clean_category(customers["segment"])
+    customers["signup_date"] = ensure_dt(customers["signup_date"])
 
     # 3) Cleaning - Orders
-    orders["order_date"] = pd.to_datetime(orders["order_date"], errors="coerce")
+    orders["order_date"] = ensure_dt(orders["order_date"])
     orders["unit_price"] = pd.to_numeric(orders["unit_price"], errors="coerce")
     orders["qty"] = pd.to_numeric(orders["qty"], errors="coerce")
     orders["discount_pct"] = pd.to_numeric(orders["discount_pct"], errors="coerce").fillna(0)
@@ -66,30 +334,60 @@ def main():
     # Dedup (just in case)
     orders = orders.drop_duplicates(subset=["order_id"])
 
-    # 4) Returns integration
-    returns["return_date"] = pd.to_datetime(returns["return_date"], errors="coerce")
-    returns_flag = returns[["order_id"]].drop_duplicates()
-    returns_flag["is_returned"] = 1
-
-    # 5) Merge / Model Data
-    model = (orders
-             .merge(products, on="product_id", how="left", validate="many_to_one")
-             .merge(customers, on="customer_id", how="left", validate="many_to_one")
-             .merge(returns_flag, on="order_id", how="left"))
-    model["is_returned"] = model["is_returned"].fillna(0).astype(int)
+    # Low-cardinality text -> category, so groupby/merge work on int codes
+    # (customers' region/city/segment already are, from clean_category)
+    for c in ("product_name", "category", "supplier"):
+        products[c] = products[c].astype("category")
+    orders["payment_mode"] = orders["payment_mode"].astype("category")
 
-    # Integrity checks (orphan ids)
-    orphan_products = model["category"].isna().sum()
-    orphan_customers = model["region"].isna().sum()
+    # 4) Returns integration
+    returns["return_date"] = ensure_dt(returns["return_date"])
+
+    # 5) Model Data: products/customers looked up by id, returned flag by membership
+    orders = orders.reset_index(drop=True)
+    parts = [
+        orders,
+        gather_by_id(products, "product_id", orders["product_id"]),
+        gather_by_id(customers, "customer_id", orders["customer_id"]),
+    ]
+    # concat can't suffix clashing names the way merge did, so refuse them
+    names = [c for part in parts for c in part.columns]
+    clashes = {c for c in names if names.count(c) > 1}
+    if clashes:
+        raise ValueError(f"Overlapping columns in orders/products/customers: {clashes}")
+    model = pd.concat(parts, axis=1)
+    returned_ids = np.unique(returns["order_id"].dropna().to_numpy())
+    model["is_returned"] = isin_sorted(model["order_id"].to_numpy(), returned_ids).astype(np.int8)
+
+    # Integrity checks (orphan ids): unmatched rows carry category code -1
+    orphan_products = int((model["category"].cat.codes.to_numpy() < 0).sum())
+    orphan_customers = int((model["region"].cat.codes.to_numpy() < 0).sum())
 
     # 6) Calculated columns
-    model["gross_sales"] = model["qty"] * model["unit_price"]
-    model["discount_amt"] = model["gross_sales"] * (model["discount_pct"]/100.0)
-    model["net_sales"] = model["gross_sales"] - model["discount_amt"]
-    model["tax_amt"] = model["net_sales"] * model["tax_rate"].fillna(0)
-    model["cogs"] = model["qty"] * model["cost"].fillna(0)
-    model["profit"] = (model["net_sales"] - model["tax_amt"]) - model["cogs"]
-    model["margin_pct"] = np.where(model["net_sales"] > 0, model["profit"]/model["net_sales"], 0)
+    # Plain float arrays instead of Series expressions: no index alignment,
+    # and discount/profit are updated in place, so fewer temporaries
+    qty = model["qty"].to_numpy(dtype=np.float64)
+    unit_price = model["unit_price"].to_numpy(dtype=np.float64)
+    tax_rate = model["tax_rate"].fillna(0).to_numpy(dtype=np.float64)
+    cost = model["cost"].fillna(0).to_numpy(dtype=np.float64)
+
+    gross_sales = qty * unit_price
+    discount_amt = model["discount_pct"].to_numpy(dtype=np.float64) / 100.0
+    discount_amt *= gross_sales
+    net_sales = gross_sales - discount_amt
+    tax_amt = net_sales * tax_rate
+    cogs = qty * cost
+    profit = net_sales - tax_amt
+    profit -= cogs
+    margin_pct = np.divide(profit, net_sales, out=np.zeros_like(net_sales), where=net_sales > 0)
+
+    model["gross_sales"] = gross_sales
+    model["discount_amt"] = discount_amt
+    model["net_sales"] = net_sales
+    model["tax_amt"] = tax_amt
+    model["cogs"] = cogs
+    model["profit"] = profit
+    model["margin_pct"] = margin_pct
 
     model["month"] = model["order_date"].dt.to_period("M").astype(str)
     model["quarter"] = model["order_date"].dt.to_period("Q").astype(str)
@@ -115,28 +413,26 @@ def main():
     ], columns=["Metric", "Value"])
 
     # 8) Pivots
-    pivot_region_month = (model
-        .groupby(["month","region"], dropna=False)
-        .agg(net_sales=("net_sales","sum"), profit=("profit","sum"), orders=("order_id","count"), returns=("is_returned","sum"))
-        .reset_index()
+    pivot_region_month = (compute_pivot_region_month(model)
         .sort_values(["month","net_sales"], ascending=[True, False])
     )
     pivot_category = (model
-        .groupby(["category"], dropna=False)
+        .groupby(["category"], dropna=False, observed=True)
         .agg(net_sales=("net_sales","sum"), profit=("profit","sum"), margin_pct=("margin_pct","mean"), orders=("order_id","count"))
         .reset_index()
         .sort_values("net_sales", ascending=False)
     )
 
     # 9) Target vs Actual
-    actual = (model.groupby(["month","region"], dropna=False)["net_sales"].sum().reset_index())
+    # same (month, region) grouping as the pivot: reuse it (index = group order)
+    actual = pivot_region_month.sort_index()[["month","region","net_sales"]]
     tgt = targets.copy()
     tgt["month"] = tgt["month"].astype(str)
     tva = actual.merge(tgt, on=["month","region"], how="left")
     tva["achievement_pct"] = np.where(tva["target_sales"]>0, tva["net_sales"]/tva["target_sales"], np.nan)
 
     # 10) Pareto - Top products
-    prod = model.groupby("product_name")["net_sales"].sum().sort_values(ascending=False).reset_index()
+    prod = model.groupby("product_name", observed=True)["net_sales"].sum().sort_values(ascending=False).reset_index()
     prod["cum_sales"] = prod["net_sales"].cumsum()
     prod["cum_pct"] = prod["cum_sales"] / prod["net_sales"].sum()
 
@@ -150,63 +446,61 @@ def main():
     rfm["recency_days"] = (ref_date - rfm["last_purchase"]).dt.days
 
     # simple scoring (quintiles)
-    rfm["R"] = pd.qcut(rfm["recency_days"], 5, labels=[5,4,3,2,1]).astype(int)
-    rfm["F"] = pd.qcut(rfm["frequency"].rank(method="first"), 5, labels=[1,2,3,4,5]).astype(int)
-    rfm["M"] = pd.qcut(rfm["monetary"].rank(method="first"), 5, labels=[1,2,3,4,5]).astype(int)
+    rfm["R"] = quintile_score(rfm["recency_days"].to_numpy(), reverse=True)
+    rfm["F"] = quintile_score(first_rank(rfm["frequency"].to_numpy()))
+    rfm["M"] = quintile_score(first_rank(rfm["monetary"].to_numpy()))
     rfm["RFM_Score"] = rfm["R"]*100 + rfm["F"]*10 + rfm["M"]
 
     # 12) Anomalies
     # very high order value OR very high discount
-    anomalies = model[(model["net_sales"] > model["net_sales"].quantile(0.995)) | (model["discount_pct"] >= 40)]
+    net_sales = model["net_sales"].to_numpy()
+    mask = (net_sales > quantile_select(net_sales, 0.995)) | (model["discount_pct"].to_numpy() >= 40)
+    anomalies = model[mask]
     anomalies = anomalies[["order_id","order_date","customer_id","product_name","region","net_sales","discount_pct","payment_mode"]].sort_values("net_sales", ascending=False)
 
-    # 13) Write to Excel
-    with pd.ExcelWriter(OUTPUT_FILE, engine="openpyxl") as w:
-        orders.to_excel(w, "Clean_Orders", index=False)
-        model.to_excel(w, "Model_Data", index=False)
-        kpis.to_excel(w, "KPIs", index=False)
-        pivot_region_month.to_excel(w, "Pivot_Region_Month", index=False)
-        pivot_category.to_excel(w, "Pivot_Category", index=False)
-        tva.to_excel(w, "Target_vs_Actual", index=False)
-        prod.head(200).to_excel(w, "Pareto_Products", index=False)
-        rfm.to_excel(w, "Customer_RFM", index=False)
-        anomalies.to_excel(w, "Anomalies", index=False)
-
-    # 14) Excel Formatting + Charts
-    wb = load_workbook(OUTPUT_FILE)
-
-    for s in wb.sheetnames:
-        ws = wb[s]
-        style_sheet(ws)
-        autofit(ws)
+    # 13) Write to Excel + formatting + charts (single pass, single save)
+    wb = Workbook(write_only=True)
+    wb.add_named_style(HEADER_STYLE)
+    wb.add_named_style(BODY_STYLE)
+    write_df_streaming(wb, "Clean_Orders", orders)
+    # Model_Data is the largest sheet: openpyxl writes only its header, the
+    # body rows are rendered as XML and spliced in after saving
+    ws_model = wb.create_sheet("Model_Data")
+    autofit_from_df(ws_model, model)
+    style_sheet(ws_model, model.columns, [])
+    model_rows = sheet_xml_rows(ws_model, model)
+    write_df_streaming(wb, "KPIs", kpis)
+
+    # Pivot_Region_Month with a helper area on the right for month totals
+    month_tot = pivot_region_month.groupby("month", sort=True)["net_sales"].sum().reset_index()
+    start_col = len(pivot_region_month.columns) + 2
+    prm_header = [*pivot_region_month.columns, None, "month", "net_sales"]
+    # month totals as plain (month, net_sales) tuples, laid beside the pivot rows
+    tot_rows = list(zip(month_tot["month"].tolist(), month_tot["net_sales"].astype(float).tolist()))
+    prm_rows = (row + [None, *tot] for row, tot in
+                zip_longest(df_rows(pivot_region_month), tot_rows, fillvalue=(None, None)))
+    ws_prm = wb.create_sheet("Pivot_Region_Month")
+    autofit_from_df(ws_prm, pivot_region_month)
+    autofit_from_df(ws_prm, month_tot, start_col=start_col)
+    style_sheet(ws_prm, prm_header, prm_rows)
+
+    ws_cat = write_df_streaming(wb, "Pivot_Category", pivot_category)
+    write_df_streaming(wb, "Target_vs_Actual", tva)
+    write_df_streaming(wb, "Pareto_Products", prod.head(200))
+    write_df_streaming(wb, "Customer_RFM", rfm)
+    write_df_streaming(wb, "Anomalies", anomalies)
 
     # Conditional formatting: Pivot_Category margin low highlight
-    ws_cat = wb["Pivot_Category"]
-    # find margin_pct col
-    headers = [c.value for c in ws_cat[1]]
-    if "margin_pct" in headers:
-        col = get_column_letter(headers.index("margin_pct")+1)
-        rng = f"{col}2:{col}{ws_cat.max_row}"
+    if "margin_pct" in pivot_category.columns:
+        col = get_column_letter(pivot_category.columns.get_loc("margin_pct")+1)
+        rng = f"{col}2:{col}{len(pivot_category)+1}"
         ws_cat.conditional_formatting.add(
             rng,
             CellIsRule(operator="lessThan", formula=["0.10"],
                        fill=PatternFill("solid", fgColor="FFC7CE"))
         )
 
-    # Chart: month-wise net_sales (aggregate from Pivot_Region_Month)
-    ws_prm = wb["Pivot_Region_Month"]
-    # Build a helper area on the right for month totals
-    prm_df = pd.read_excel(OUTPUT_FILE, sheet_name="Pivot_Region_Month")
-    month_tot = prm_df.groupby("month")["net_sales"].sum().reset_index()
-    start_col = ws_prm.max_column + 2
-    ws_prm.cell(row=1, column=start_col, value="month")
-    ws_prm.cell(row=1, column=start_col+1, value="net_sales")
-    for i, row in enumerate(month_tot.itertuples(index=False), start=2):
-        ws_prm.cell(row=i, column=start_col, value=row.month)
-        ws_prm.cell(row=i, column=start_col+1, value=float(row.net_sales))
-
-    style_sheet(ws_prm, freeze="A2")
-
+    # Chart: month-wise net_sales (from the month totals helper area)
     chart = LineChart()
     chart.title = "Monthly Net Sales"
     chart.y_axis.title = "Net Sales"
@@ -221,7 +515,8 @@ def main():
     ws_prm.add_chart(chart, f"{get_column_letter(start_col)}{2 + len(month_tot) + 2}")
 
     wb.save(OUTPUT_FILE)
+    splice_sheet_rows(OUTPUT_FILE, ws_model, model_rows)
     print(f"✅ Done! Generated: {OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()